@@ -2,20 +2,68 @@
 
 import sqlite3
 import json
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
 from pathlib import Path
 import argparse
-import uuid
+import functools
+import secrets
 import math
+import threading
 
 # Database initialization
 DB_PATH = Path.home() / ".blackroad" / "logistics.db"
 
-SHIPMENT_STATUSES = ["pending", "picked_up", "in_transit", "out_for_delivery", "delivered", "exception"]
-PRIORITIES = ["standard", "express", "overnight"]
-CARRIERS = ["fedex", "ups", "usps", "dhl", "blackroad-express"]
+# Ordered tuples for messages and CLI help; frozensets for O(1) validation
+SHIPMENT_STATUSES_LIST = ("pending", "picked_up", "in_transit", "out_for_delivery", "delivered", "exception")
+PRIORITIES_LIST = ("standard", "express", "overnight")
+CARRIERS_LIST = ("fedex", "ups", "usps", "dhl", "blackroad-express")
+
+SHIPMENT_STATUSES = frozenset(SHIPMENT_STATUSES_LIST)
+PRIORITIES = frozenset(PRIORITIES_LIST)
+CARRIERS = frozenset(CARRIERS_LIST)
+
+# Column list in Shipment field order, so rows can be passed positionally
+SHIPMENT_COLUMNS = (
+    "id, origin, destination, weight_kg, priority, status, "
+    "eta, carrier, tracking_id, created_at"
+)
+
+# get_shipments queries keyed by (has_status << 1) | has_priority; fixed
+# statement texts let sqlite3's per-connection statement cache reuse them
+SHIPMENT_FILTER_QUERIES = tuple(
+    f"SELECT {SHIPMENT_COLUMNS} FROM shipments{where} ORDER BY created_at DESC"
+    for where in (
+        "",
+        " WHERE priority = ?",
+        " WHERE status = ?",
+        " WHERE status = ? AND priority = ?",
+    )
+)
+
+INSERT_SHIPMENT_SQL = "INSERT INTO shipments VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+# Per-(carrier, status) aggregates for delivery_stats; transit days are
+# floored to match timedelta.days semantics
+DELIVERY_STATS_SQL = """
+    SELECT carrier, status, COUNT(*) AS total,
+           SUM(CASE WHEN eta_jd >= julianday('now') THEN 1 ELSE 0 END) AS on_time,
+           SUM(CAST(transit AS INTEGER) - (transit < CAST(transit AS INTEGER))) AS transit_days,
+           COUNT(eta_jd) AS with_eta
+    FROM (
+        SELECT carrier, status, julianday(eta) AS eta_jd,
+               julianday(eta) - julianday(created_at) AS transit
+        FROM shipments
+    )
+    GROUP BY carrier, status
+"""
+
+# Stay under SQLite's default bound-parameter limit for IN (...) queries
+SQLITE_MAX_PARAMS = 900
+
+# Rows fetched per round-trip when streaming query results
+FETCH_BATCH_SIZE = 500
 
 # Major city coordinates (latitude, longitude)
 CITY_COORDS = {
@@ -41,8 +89,81 @@ CITY_COORDS = {
     "STL": (38.6270, -90.1994),
 }
 
+EARTH_RADIUS_KM = 6371
 
-@dataclass
+# City coordinates converted to radians once at import
+CITY_COORDS_RAD = {
+    city: (math.radians(lat), math.radians(lon))
+    for city, (lat, lon) in CITY_COORDS.items()
+}
+
+# City index and per-index radian coordinates for bulk distance computations
+CITY_IDX = {city: i for i, city in enumerate(CITY_COORDS)}
+CITY_NAMES = tuple(CITY_COORDS)
+CITY_LATS_RAD = [lat for lat, _ in CITY_COORDS_RAD.values()]
+CITY_LONS_RAD = [lon for _, lon in CITY_COORDS_RAD.values()]
+
+
+def _haversine_pairwise(lats: List[float], lons: List[float]) -> List[List[float]]:
+    """Build a symmetric N x N Haversine distance matrix (km) from radian coordinates."""
+    n = len(lats)
+    matrix = [[0.0] * n for _ in range(n)]
+
+    # cos(lat) is computed once per point rather than twice per pair
+    sin, asin, sqrt = math.sin, math.asin, math.sqrt
+    coss = [math.cos(lat) for lat in lats]
+    diameter = 2 * EARTH_RADIUS_KM
+    for i in range(n):
+        lat_i, lon_i, cos_i, row_i = lats[i], lons[i], coss[i], matrix[i]
+        for j in range(i + 1, n):
+            a = sin((lats[j] - lat_i) / 2) ** 2 + cos_i * coss[j] * sin((lons[j] - lon_i) / 2) ** 2
+            row_i[j] = matrix[j][i] = diameter * asin(sqrt(a))
+    return matrix
+
+
+# Precomputed city-to-city distances in km (20 x 20), so lookups need no trig
+CITY_DISTANCE_MATRIX = _haversine_pairwise(CITY_LATS_RAD, CITY_LONS_RAD)
+
+
+def _nearest_neighbor_tour(nodes: List[int], dist: List[List[float]]) -> List[int]:
+    """Greedy seed tour starting at nodes[0], always visiting the closest unvisited node."""
+    tour = [nodes[0]]
+    remaining = set(nodes[1:])
+    while remaining:
+        row = dist[tour[-1]]
+        nearest = min(remaining, key=row.__getitem__)
+        tour.append(nearest)
+        remaining.remove(nearest)
+    return tour
+
+
+def _two_opt(tour: List[int], dist: List[List[float]]) -> List[int]:
+    """Improve a closed tour with 2-opt swaps until no move shortens it.
+
+    Each candidate move is scored by its edge-length delta, so evaluating
+    a swap is O(1) rather than re-measuring the whole tour.
+    """
+    tour = list(tour)
+    n = len(tour)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(n - 1):
+            a, b = tour[i], tour[i + 1]
+            for j in range(i + 2, n):
+                # Edges (i, i+1) and (n-1, 0) are adjacent when i == 0
+                if i == 0 and j == n - 1:
+                    continue
+                c, d = tour[j], tour[(j + 1) % n]
+                delta = dist[a][c] + dist[b][d] - dist[a][b] - dist[c][d]
+                if delta < -1e-9:
+                    tour[i + 1:j + 1] = reversed(tour[i + 1:j + 1])
+                    b = tour[i + 1]
+                    improved = True
+    return tour
+
+
+@dataclass(slots=True)
 class Shipment:
     """Represents a shipment."""
     id: str
@@ -57,8 +178,40 @@ class Shipment:
     created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for storage."""
-        return asdict(self)
+        """Convert to dictionary."""
+        return {
+            "id": self.id,
+            "origin": self.origin,
+            "destination": self.destination,
+            "weight_kg": self.weight_kg,
+            "priority": self.priority,
+            "status": self.status,
+            "eta": self.eta,
+            "carrier": self.carrier,
+            "tracking_id": self.tracking_id,
+            "created_at": self.created_at,
+        }
+
+    def to_row(self) -> tuple:
+        """Convert to a tuple in table column order for storage."""
+        return (
+            self.id, self.origin, self.destination, self.weight_kg, self.priority,
+            self.status, self.eta, self.carrier, self.tracking_id, self.created_at,
+        )
+
+
+def _unique_shipment_id(seen: set) -> str:
+    """Generate a shipment id not already in ``seen``, and record it there."""
+    while True:
+        shipment_id = secrets.token_hex(4)
+        if shipment_id not in seen:
+            seen.add(shipment_id)
+            return shipment_id
+
+
+def _shipment_factory(cursor: sqlite3.Cursor, row: tuple) -> Shipment:
+    """Row factory building a Shipment straight from a SHIPMENT_COLUMNS row."""
+    return Shipment(*row)
 
 
 class LogisticsPlanner:
@@ -68,12 +221,22 @@ class LogisticsPlanner:
         """Initialize the planner with SQLite database."""
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.db_path, isolation_level=None, check_same_thread=False
+        )
+        self._conn.row_factory = sqlite3.Row
         self._init_db()
 
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
     def _init_db(self):
         """Initialize SQLite database schema."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
+        with self._lock:
+            self._conn.execute("""
                 CREATE TABLE IF NOT EXISTS shipments (
                     id TEXT PRIMARY KEY,
                     origin TEXT NOT NULL,
@@ -87,25 +250,37 @@ class LogisticsPlanner:
                     created_at TEXT NOT NULL
                 )
             """)
-            conn.commit()
+            # One index per get_shipments filter combination, each ending in
+            # created_at DESC so ORDER BY needs no separate sort
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_ship_created ON shipments(created_at DESC)"
+            )
+            self._conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_ship_status_created
+                ON shipments(status, created_at DESC)
+            """)
+            self._conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_ship_status_prio_created
+                ON shipments(status, priority, created_at DESC)
+            """)
+            self._conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_ship_prio_created
+                ON shipments(priority, created_at DESC)
+            """)
+            # Covers every column delivery_stats reads, in GROUP BY order, so
+            # the aggregate scans the index alone without sorting
+            self._conn.execute("DROP INDEX IF EXISTS idx_ship_carrier")
+            self._conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_ship_carrier_stats
+                ON shipments(carrier, status, eta, created_at)
+            """)
 
-    @staticmethod
-    def _haversine_distance(coord1: tuple, coord2: tuple) -> float:
-        """Calculate distance between two coordinates using Haversine formula."""
-        lat1, lon1 = coord1
-        lat2, lon2 = coord2
-        
-        R = 6371  # Earth radius in km
-        
-        lat1_rad = math.radians(lat1)
-        lat2_rad = math.radians(lat2)
-        delta_lat = math.radians(lat2 - lat1)
-        delta_lon = math.radians(lon2 - lon1)
-        
-        a = math.sin(delta_lat / 2) ** 2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2
-        c = 2 * math.asin(math.sqrt(a))
-        
-        return R * c
+            # WAL persists in the database file; the rest are per-connection
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA temp_store=MEMORY")
+            self._conn.execute("PRAGMA mmap_size=268435456")
+            self._conn.execute("PRAGMA cache_size=-20000")
 
     def create_shipment(
         self,
@@ -116,9 +291,9 @@ class LogisticsPlanner:
     ) -> str:
         """Create a new shipment."""
         if priority not in PRIORITIES:
-            raise ValueError(f"Invalid priority. Must be one of: {PRIORITIES}")
+            raise ValueError(f"Invalid priority. Must be one of: {', '.join(PRIORITIES_LIST)}")
 
-        shipment_id = str(uuid.uuid4())[:8]
+        shipment_id = secrets.token_hex(4)
         shipment = Shipment(
             id=shipment_id,
             origin=origin,
@@ -128,20 +303,69 @@ class LogisticsPlanner:
             status="pending",
         )
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                INSERT INTO shipments VALUES (
-                    :id, :origin, :destination, :weight_kg, :priority, :status,
-                    :eta, :carrier, :tracking_id, :created_at
-                )
-                """,
-                shipment.to_dict(),
-            )
-            conn.commit()
+        with self._lock:
+            self._conn.execute(INSERT_SHIPMENT_SQL, shipment.to_row())
 
         return shipment_id
 
+    def bulk_create(self, shipments: List[tuple]) -> List[str]:
+        """Create many shipments in one transaction.
+
+        Each item is an ``(origin, destination, weight_kg[, priority])`` tuple.
+        """
+        rows = []
+        seen = set()
+        for item in shipments:
+            if len(item) not in (3, 4):
+                raise ValueError(
+                    "Each shipment must be an (origin, destination, weight_kg[, priority]) tuple"
+                )
+            origin, destination, weight_kg, *rest = item
+            priority = rest[0] if rest else "standard"
+            if priority not in PRIORITIES:
+                raise ValueError(f"Invalid priority. Must be one of: {', '.join(PRIORITIES_LIST)}")
+            rows.append(Shipment(
+                id=_unique_shipment_id(seen),
+                origin=origin,
+                destination=destination,
+                weight_kg=weight_kg,
+                priority=priority,
+                status="pending",
+            ))
+
+        with self._lock:
+            # IMMEDIATE takes the write lock up front, so ids checked free
+            # below cannot be claimed by another writer before the insert
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                pending = rows
+                while pending:
+                    taken = self._existing_ids([s.id for s in pending])
+                    pending = [s for s in pending if s.id in taken]
+                    for s in pending:
+                        s.id = _unique_shipment_id(seen)
+                self._conn.executemany(
+                    INSERT_SHIPMENT_SQL, (s.to_row() for s in rows)
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+        return [s.id for s in rows]
+
+    def _existing_ids(self, ids: List[str]) -> set:
+        """Return the subset of ids already present in the shipments table."""
+        found = set()
+        for start in range(0, len(ids), SQLITE_MAX_PARAMS):
+            chunk = ids[start:start + SQLITE_MAX_PARAMS]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = self._conn.execute(
+                f"SELECT id FROM shipments WHERE id IN ({placeholders})", chunk
+            )
+            found.update(row["id"] for row in cursor)
+        return found
+
     def assign_carrier(
         self,
         shipment_id: str,
@@ -151,56 +375,64 @@ class LogisticsPlanner:
     ):
         """Assign a carrier to a shipment."""
         if carrier not in CARRIERS:
-            raise ValueError(f"Invalid carrier. Must be one of: {CARRIERS}")
+            raise ValueError(f"Invalid carrier. Must be one of: {', '.join(CARRIERS_LIST)}")
 
         eta = (datetime.utcnow() + timedelta(days=eta_days)).isoformat()
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
+        with self._lock:
+            self._conn.execute(
                 """
                 UPDATE shipments SET carrier = ?, tracking_id = ?, eta = ?, status = ?
                 WHERE id = ?
                 """,
                 (carrier, tracking_id, eta, "picked_up", shipment_id),
             )
-            conn.commit()
 
     def update_status(self, shipment_id: str, status: str):
         """Update shipment status."""
         if status not in SHIPMENT_STATUSES:
-            raise ValueError(f"Invalid status. Must be one of: {SHIPMENT_STATUSES}")
+            raise ValueError(f"Invalid status. Must be one of: {', '.join(SHIPMENT_STATUSES_LIST)}")
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
+        with self._lock:
+            self._conn.execute(
                 "UPDATE shipments SET status = ? WHERE id = ?",
                 (status, shipment_id),
             )
-            conn.commit()
 
     def get_shipments(
         self,
         status: Optional[str] = None,
         priority: Optional[str] = None,
+    ) -> Iterator[Shipment]:
+        """Stream shipments, optionally filtered by status and/or priority.
+
+        Every filter combination is served by an index ending in
+        ``created_at DESC``, so SQLite walks rows in order without a sort
+        step and only ``FETCH_BATCH_SIZE`` rows are held at a time.
+        """
+        query = SHIPMENT_FILTER_QUERIES[(bool(status) << 1) | bool(priority)]
+        params = tuple(v for v in (status, priority) if v)
+
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.row_factory = _shipment_factory
+            cursor.execute(query, params)
+
+        # Fetch in batches so the lock is not held while the caller consumes rows
+        while True:
+            with self._lock:
+                batch = cursor.fetchmany(FETCH_BATCH_SIZE)
+            if not batch:
+                return
+            yield from batch
+
+    def list_shipments(
+        self,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
     ) -> List[Shipment]:
-        """Get shipments, optionally filtered by status and/or priority."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            
-            query = "SELECT * FROM shipments WHERE 1=1"
-            params = []
-            
-            if status:
-                query += " AND status = ?"
-                params.append(status)
-            if priority:
-                query += " AND priority = ?"
-                params.append(priority)
-            
-            query += " ORDER BY created_at DESC"
-            cursor = conn.execute(query, params)
-            rows = cursor.fetchall()
-
-        return [Shipment(**dict(row)) for row in rows]
+        """Get shipments as a list, optionally filtered by status and/or priority."""
+        return list(self.get_shipments(status=status, priority=priority))
 
     def get_route(self, origin: str, destination: str) -> Dict[str, Any]:
         """Get route information between two cities."""
@@ -209,106 +441,110 @@ class LogisticsPlanner:
                 "error": f"Unknown city. Available cities: {list(CITY_COORDS.keys())}"
             }
 
-        distance_km = self._haversine_distance(
-            CITY_COORDS[origin],
-            CITY_COORDS[destination],
-        )
-        
-        # Rough estimate: average truck speed 80 km/h
-        duration_h = distance_km / 80
+        distance_km, duration_h = self._compute_route(origin, destination)
 
         return {
             "origin": origin,
             "destination": destination,
-            "distance_km": round(distance_km, 1),
-            "duration_h": round(duration_h, 1),
+            "distance_km": distance_km,
+            "duration_h": duration_h,
             "stops": [origin, destination],
         }
 
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
+    def _compute_route(origin: str, destination: str) -> tuple:
+        """Compute rounded (distance_km, duration_h) for a known city pair."""
+        distance_km = CITY_DISTANCE_MATRIX[CITY_IDX[origin]][CITY_IDX[destination]]
+
+        # Rough estimate: average truck speed 80 km/h
+        duration_h = distance_km / 80
+
+        return round(distance_km, 1), round(duration_h, 1)
+
+    def optimize_tour(self, cities: List[str]) -> Dict[str, Any]:
+        """Plan a closed multi-stop tour starting and ending at the first city."""
+        if not cities:
+            return {"error": "No cities given."}
+        if any(c not in CITY_COORDS for c in cities):
+            return {
+                "error": f"Unknown city. Available cities: {list(CITY_COORDS.keys())}"
+            }
+
+        nodes = [CITY_IDX[c] for c in dict.fromkeys(cities)]
+        dist = CITY_DISTANCE_MATRIX
+        tour = _two_opt(_nearest_neighbor_tour(nodes, dist), dist)
+
+        distance_km = sum(dist[tour[k - 1]][tour[k]] for k in range(len(tour)))
+        stops = [CITY_NAMES[k] for k in tour]
+
+        return {
+            "distance_km": round(distance_km, 1),
+            # Rough estimate: average truck speed 80 km/h
+            "duration_h": round(distance_km / 80, 1),
+            "stops": stops + [stops[0]],
+        }
+
     def optimize_batch(self, shipment_ids: List[str]) -> Dict[str, Any]:
         """Optimize batch of shipments by grouping by carrier and region."""
-        shipments = []
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            for sid in shipment_ids:
-                cursor = conn.execute(
-                    "SELECT * FROM shipments WHERE id = ?", (sid,)
+        found = {}
+        with self._lock:
+            for start in range(0, len(shipment_ids), SQLITE_MAX_PARAMS):
+                chunk = shipment_ids[start:start + SQLITE_MAX_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                cursor = self._conn.execute(
+                    f"SELECT id, carrier, priority FROM shipments WHERE id IN ({placeholders})",
+                    chunk,
                 )
-                row = cursor.fetchone()
-                if row:
-                    shipments.append(Shipment(**dict(row)))
+                for row in cursor:
+                    found[row["id"]] = row
 
-        # Group by carrier
-        by_carrier = {}
-        for s in shipments:
-            if s.carrier:
-                if s.carrier not in by_carrier:
-                    by_carrier[s.carrier] = []
-                by_carrier[s.carrier].append(s)
+        shipments = [found[sid] for sid in shipment_ids if sid in found]
 
-        # Group by priority
+        # Group by carrier and priority
+        by_carrier = {}
         by_priority = {}
-        for s in shipments:
-            if s.priority not in by_priority:
-                by_priority[s.priority] = []
-            by_priority[s.priority].append(s)
+        for row in shipments:
+            carrier, priority = row["carrier"], row["priority"]
+            if carrier:
+                by_carrier[carrier] = by_carrier.get(carrier, 0) + 1
+            by_priority[priority] = by_priority.get(priority, 0) + 1
 
         return {
             "total_shipments": len(shipments),
-            "by_carrier": {
-                carrier: len(ships) for carrier, ships in by_carrier.items()
-            },
-            "by_priority": {
-                priority: len(ships) for priority, ships in by_priority.items()
-            },
+            "by_carrier": by_carrier,
+            "by_priority": by_priority,
         }
 
     def delivery_stats(self) -> Dict[str, Any]:
         """Calculate delivery performance statistics."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute("SELECT * FROM shipments")
+        with self._lock:
+            cursor = self._conn.execute(DELIVERY_STATS_SQL)
             rows = cursor.fetchall()
 
-        shipments = [Shipment(**dict(row)) for row in rows]
-
-        delivered = [s for s in shipments if s.status == "delivered"]
-        exception = [s for s in shipments if s.status == "exception"]
-
-        # Calculate on-time delivery rate
-        on_time_count = 0
-        if delivered:
-            for s in delivered:
-                if s.eta:
-                    eta_time = datetime.fromisoformat(s.eta)
-                    if eta_time >= datetime.utcnow():
-                        on_time_count += 1
-
-        on_time_rate = (on_time_count / len(delivered) * 100) if delivered else 0
-
-        # Calculate average transit time
-        avg_transit_days = 0
-        if delivered:
-            transit_times = []
-            for s in delivered:
-                created = datetime.fromisoformat(s.created_at)
-                # Use eta as proxy for completion time
-                if s.eta:
-                    eta_time = datetime.fromisoformat(s.eta)
-                    transit_days = (eta_time - created).days
-                    transit_times.append(transit_days)
-            if transit_times:
-                avg_transit_days = sum(transit_times) / len(transit_times)
-
-        # Performance by carrier
+        total = delivered = exception = on_time_count = 0
+        transit_sum = transit_count = 0
         by_carrier = {}
-        for s in shipments:
-            if s.carrier:
-                if s.carrier not in by_carrier:
-                    by_carrier[s.carrier] = {"delivered": 0, "total": 0}
-                by_carrier[s.carrier]["total"] += 1
-                if s.status == "delivered":
-                    by_carrier[s.carrier]["delivered"] += 1
+        for row in rows:
+            carrier, status, count = row["carrier"], row["status"], row["total"]
+            total += count
+            if status == "delivered":
+                delivered += count
+                on_time_count += row["on_time"]
+                transit_sum += row["transit_days"] or 0
+                transit_count += row["with_eta"]
+            elif status == "exception":
+                exception += count
+
+            # Performance by carrier
+            if carrier:
+                stats = by_carrier.setdefault(carrier, {"delivered": 0, "total": 0})
+                stats["total"] += count
+                if status == "delivered":
+                    stats["delivered"] += count
+
+        on_time_rate = (on_time_count / delivered * 100) if delivered else 0
+        avg_transit_days = (transit_sum / transit_count) if transit_count else 0
 
         carrier_performance = {
             carrier: {
@@ -320,9 +556,9 @@ class LogisticsPlanner:
         }
 
         return {
-            "total_shipments": len(shipments),
-            "delivered": len(delivered),
-            "in_exception": len(exception),
+            "total_shipments": total,
+            "delivered": delivered,
+            "in_exception": exception,
             "on_time_rate_pct": round(on_time_rate, 1),
             "avg_transit_days": round(avg_transit_days, 1),
             "by_carrier": carrier_performance,
@@ -348,7 +584,7 @@ def main():
         "priority",
         nargs="?",
         default="standard",
-        help="Priority (standard/express/overnight)",
+        help=f"Priority ({'/'.join(PRIORITIES_LIST)})",
     )
 
     # Stats command
@@ -359,18 +595,23 @@ def main():
     route_parser.add_argument("origin", help="Origin city")
     route_parser.add_argument("destination", help="Destination city")
 
+    # Tour command
+    tour_parser = subparsers.add_parser("tour", help="Plan a multi-stop tour")
+    tour_parser.add_argument("cities", nargs="+", help="Cities to visit, starting city first")
+
     args = parser.parse_args()
     planner = LogisticsPlanner()
 
     if args.command == "list":
-        shipments = planner.get_shipments(status=args.status, priority=args.priority)
-        if not shipments:
-            print("No shipments found.")
-            return
-        print(f"{'ID':<10} {'Origin':<8} {'Dest':<8} {'Status':<18} {'Priority':<10}")
-        print("-" * 60)
-        for s in shipments:
+        found = False
+        for s in planner.get_shipments(status=args.status, priority=args.priority):
+            if not found:
+                print(f"{'ID':<10} {'Origin':<8} {'Dest':<8} {'Status':<18} {'Priority':<10}")
+                print("-" * 60)
+                found = True
             print(f"{s.id:<10} {s.origin:<8} {s.destination:<8} {s.status:<18} {s.priority:<10}")
+        if not found:
+            print("No shipments found.")
 
     elif args.command == "create":
         sid = planner.create_shipment(
@@ -389,6 +630,10 @@ def main():
         route = planner.get_route(args.origin, args.destination)
         print(json.dumps(route, indent=2))
 
+    elif args.command == "tour":
+        tour = planner.optimize_tour(args.cities)
+        print(json.dumps(tour, indent=2))
+
     else:
         parser.print_help()
 
@@ -0,0 +1,264 @@
+"""Tests for the logistics planner."""
+
+import itertools
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from logistics_planner import (  # noqa: E402
+    CITY_DISTANCE_MATRIX,
+    CITY_IDX,
+    CITY_NAMES,
+    DELIVERY_STATS_SQL,
+    SHIPMENT_FILTER_QUERIES,
+    LogisticsPlanner,
+    Shipment,
+    _nearest_neighbor_tour,
+)
+
+
+@pytest.fixture
+def planner(tmp_path):
+    p = LogisticsPlanner(tmp_path / "logistics.db")
+    yield p
+    p.close()
+
+
+def _reference_stats(shipments):
+    """Delivery stats computed the way the original Python implementation did."""
+    delivered = [s for s in shipments if s.status == "delivered"]
+    exception = [s for s in shipments if s.status == "exception"]
+
+    now = datetime.utcnow()
+    on_time_count = sum(
+        1 for s in delivered if s.eta and datetime.fromisoformat(s.eta) >= now
+    )
+    on_time_rate = (on_time_count / len(delivered) * 100) if delivered else 0
+
+    transit_times = [
+        (datetime.fromisoformat(s.eta) - datetime.fromisoformat(s.created_at)).days
+        for s in delivered
+        if s.eta
+    ]
+    avg_transit_days = sum(transit_times) / len(transit_times) if transit_times else 0
+
+    by_carrier = {}
+    for s in shipments:
+        if s.carrier:
+            stats = by_carrier.setdefault(s.carrier, {"delivered": 0, "total": 0})
+            stats["total"] += 1
+            if s.status == "delivered":
+                stats["delivered"] += 1
+
+    return {
+        "total_shipments": len(shipments),
+        "delivered": len(delivered),
+        "in_exception": len(exception),
+        "on_time_rate_pct": round(on_time_rate, 1),
+        "avg_transit_days": round(avg_transit_days, 1),
+        "by_carrier": {
+            carrier: {"delivery_rate": round(stats["delivered"] / stats["total"] * 100, 1)}
+            for carrier, stats in by_carrier.items()
+        },
+    }
+
+
+def test_delivery_stats_matches_reference_semantics(planner):
+    now = datetime.utcnow()
+    created = now - timedelta(days=5, hours=3)
+
+    def ship(n, status, carrier, eta_offset_days):
+        eta = None
+        if eta_offset_days is not None:
+            eta = (created + timedelta(days=eta_offset_days)).isoformat()
+        return Shipment(
+            id=f"s{n}",
+            origin="NYC",
+            destination="LAX",
+            weight_kg=1.0,
+            priority="standard",
+            status=status,
+            eta=eta,
+            carrier=carrier,
+            tracking_id=None,
+            created_at=created.isoformat(),
+        )
+
+    shipments = [
+        # Negative, zero and positive transit, with fractional days either side
+        ship(1, "delivered", "ups", -2.5),
+        ship(2, "delivered", "ups", -1),
+        ship(3, "delivered", "fedex", 0),
+        ship(4, "delivered", "fedex", 0.4),
+        ship(5, "delivered", "dhl", 3.2),
+        # ETA still in the future relative to now (on time)
+        ship(6, "delivered", "dhl", 7.9),
+        ship(7, "delivered", "usps", 12),
+        # Delivered without an ETA or carrier
+        ship(8, "delivered", None, None),
+        ship(9, "exception", "ups", 2),
+        ship(10, "exception", None, None),
+        ship(11, "pending", None, None),
+        ship(12, "in_transit", "fedex", 4),
+    ]
+    planner._conn.executemany(
+        "INSERT INTO shipments VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [s.to_row() for s in shipments],
+    )
+
+    assert planner.delivery_stats() == _reference_stats(shipments)
+
+
+def test_delivery_stats_empty(planner):
+    assert planner.delivery_stats() == {
+        "total_shipments": 0,
+        "delivered": 0,
+        "in_exception": 0,
+        "on_time_rate_pct": 0,
+        "avg_transit_days": 0,
+        "by_carrier": {},
+    }
+
+
+def test_bulk_create_regenerates_colliding_ids(planner, monkeypatch):
+    import logistics_planner
+
+    planner.bulk_create([("NYC", "LAX", 1.0)])
+    existing = next(planner.get_shipments()).id
+
+    # Duplicates within the batch and against the existing row
+    ids = iter([existing, "aaaaaaaa", "aaaaaaaa", existing, "bbbbbbbb", "cccccccc"])
+    monkeypatch.setattr(logistics_planner.secrets, "token_hex", lambda n: next(ids))
+
+    created = planner.bulk_create([("NYC", "LAX", 1.0), ("CHI", "DAL", 2.0, "express")])
+
+    assert len(set(created)) == 2
+    assert existing not in created
+    assert len(planner.list_shipments()) == 3
+
+
+def test_bulk_create_rejects_malformed_items(planner):
+    with pytest.raises(ValueError):
+        planner.bulk_create([("NYC", "LAX", 1.0, "standard", "extra")])
+    with pytest.raises(ValueError):
+        planner.bulk_create([("NYC", "LAX")])
+    assert planner.list_shipments() == []
+
+
+def test_optimize_batch_spans_chunks_and_keeps_duplicates(planner):
+    express = planner.bulk_create([("NYC", "LAX", 1.0, "express")] * 600)
+    standard = planner.bulk_create([("CHI", "DAL", 2.0)] * 400)
+    ids = express + standard
+    planner.assign_carrier(ids[0], "ups", "T1", 2)
+    planner.assign_carrier(ids[-1], "dhl", "T2", 3)
+
+    # 1006 ids crosses the SQLITE_MAX_PARAMS chunk boundary
+    result = planner.optimize_batch(ids + ids[:5] + ["missing"])
+
+    assert result == {
+        "total_shipments": 1005,
+        "by_carrier": {"ups": 2, "dhl": 1},
+        "by_priority": {"express": 605, "standard": 400},
+    }
+
+
+@pytest.mark.parametrize("query", SHIPMENT_FILTER_QUERIES)
+def test_shipment_filter_queries_stream_without_sort(planner, query):
+    params = ["delivered", "express"][:query.count("?")]
+    plan = [row[3] for row in planner._conn.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+
+    assert any("USING INDEX" in step for step in plan)
+    assert not any("TEMP B-TREE" in step for step in plan)
+
+
+def test_delivery_stats_uses_covering_index_without_sort(planner):
+    plan = [row[3] for row in planner._conn.execute(f"EXPLAIN QUERY PLAN {DELIVERY_STATS_SQL}")]
+
+    assert any("USING COVERING INDEX idx_ship_carrier_stats" in step for step in plan)
+    assert not any("TEMP B-TREE" in step for step in plan)
+
+
+def test_get_shipments_streams_in_created_order(planner):
+    planner.bulk_create([("NYC", "LAX", 1.0, "express")] * 1200)
+    planner.bulk_create([("CHI", "DAL", 1.0)] * 300)
+
+    shipments = planner.get_shipments(priority="express")
+    assert next(shipments).priority == "express"
+    rest = list(shipments)
+
+    assert len(rest) == 1199
+    created = [s.created_at for s in rest]
+    assert created == sorted(created, reverse=True)
+
+
+def test_get_route_distances(planner):
+    route = planner.get_route("NYC", "LAX")
+    assert route["distance_km"] == 3935.7
+    assert route["duration_h"] == 49.2
+    assert planner.get_route("LAX", "NYC")["distance_km"] == 3935.7
+    assert planner.get_route("NYC", "NYC")["distance_km"] == 0.0
+    assert "error" in planner.get_route("NYC", "XXX")
+
+
+def _tour_length(stops):
+    return sum(
+        CITY_DISTANCE_MATRIX[CITY_IDX[a]][CITY_IDX[b]] for a, b in zip(stops, stops[1:])
+    )
+
+
+def test_optimize_tour_keeps_start_and_dedupes(planner):
+    result = planner.optimize_tour(["DEN", "NYC", "SEA", "NYC", "MIA", "DEN"])
+
+    stops = result["stops"]
+    assert stops[0] == stops[-1] == "DEN"
+    assert sorted(stops[:-1]) == ["DEN", "MIA", "NYC", "SEA"]
+    assert result["distance_km"] == round(_tour_length(stops), 1)
+
+
+def _closed_length(tour):
+    return sum(CITY_DISTANCE_MATRIX[tour[k - 1]][tour[k]] for k in range(len(tour)))
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("n", [5, 8, 12, 20])
+def test_optimize_tour_is_two_opt_optimal(planner, n, seed):
+    cities = random.Random(seed).sample(CITY_NAMES, n)
+    nodes = [CITY_IDX[c] for c in cities]
+
+    result = planner.optimize_tour(cities)
+    tour = [CITY_IDX[c] for c in result["stops"][:-1]]
+
+    # Never worse than the nearest-neighbour seed it starts from
+    seed_tour = _nearest_neighbor_tour(nodes, CITY_DISTANCE_MATRIX)
+    assert _closed_length(tour) <= _closed_length(seed_tour) + 1e-9
+
+    # No single 2-opt move improves the returned tour
+    dist = CITY_DISTANCE_MATRIX
+    for i in range(n - 1):
+        for j in range(i + 2, n):
+            if i == 0 and j == n - 1:
+                continue
+            a, b, c, d = tour[i], tour[i + 1], tour[j], tour[(j + 1) % n]
+            assert dist[a][c] + dist[b][d] - dist[a][b] - dist[c][d] >= -1e-9
+
+
+def test_optimize_tour_matches_brute_force_for_four_cities(planner):
+    cities = ["NYC", "CHI", "ATL", "BOS"]
+    best = min(
+        _tour_length(["NYC", *perm, "NYC"]) for perm in itertools.permutations(cities[1:])
+    )
+
+    result = planner.optimize_tour(cities)
+
+    assert _tour_length(result["stops"]) == pytest.approx(best)
+
+
+def test_optimize_tour_errors(planner):
+    assert planner.optimize_tour([]) == {"error": "No cities given."}
+    assert "Unknown city" in planner.optimize_tour(["NYC", "XXX"])["error"]
+    assert planner.optimize_tour(["NYC"])["stops"] == ["NYC", "NYC"]